@@ -4,9 +4,12 @@
 # with sha256 but this is NOT a production authentication system.
 
 import streamlit as st
-from copy import deepcopy
-from datetime import datetime, date, time
+from collections import deque, namedtuple
+from datetime import datetime, time
 import hashlib
+import hmac
+import pandas as pd
+import threading
 
 # ---------------------------
 # Helper: simple password hash
@@ -16,66 +19,159 @@ def hash_password(plain: str) -> str:
     return hashlib.sha256(plain.encode("utf-8")).hexdigest()
 
 # ---------------------------
-# ToDoStack: tasks are dicts {"text":..., "deadline": datetime or None}
-# supports undo/redo by snapshotting the tasks list
+# ToDoStack: tasks are stored column-wise in parallel lists kept in lockstep:
+#   ids[i] (stable across edits, never reused), texts[i], deadlines[i]
+#   (datetime or None) and deadline_strs[i], the deadline formatted once at
+#   insertion so reruns don't re-run strftime.
+# A Task (id, text, deadline, deadline_str) is the immutable record for one row.
+# Supports undo/redo by recording reversible operations:
+#   ("add", task)            -> task was appended
+#   ("remove", index, task)  -> task was popped from index
+#   ("clear", old_columns)   -> all lists were replaced by []
+# Records hold the same str/datetime objects as the lists; Task and its fields
+# are all immutable, so nothing ever needs to be copied.
+# History is capped at HISTORY_LIMIT steps: session state lives as long as the
+# browser tab, so an unbounded history would grow with every edit.
 # ---------------------------
+HISTORY_LIMIT = 100
+
+# Default deadline time when only a date is given
+_MIDNIGHT = time(0, 0)
+
+Task = namedtuple("Task", ["id", "text", "deadline", "deadline_str"])
+
+def format_deadline(deadline: datetime | None) -> str:
+    return f"{deadline:%Y-%m-%d %H:%M}" if deadline else 'No deadline'
+
 class ToDoStack:
+    __slots__ = ("ids", "texts", "deadlines", "deadline_strs",
+                 "_next_id", "_undo_stack", "_redo_stack")
+
     def __init__(self):
-        self.tasks = []  # list of dicts: {"text": str, "deadline": datetime | None}
-        self._undo_stack = []
-        self._redo_stack = []
+        self.ids = []            # list[int]
+        self.texts = []          # list[str]
+        self.deadlines = []      # list[datetime | None]
+        self.deadline_strs = []  # list[str]
+        self._next_id = 0
+        self._undo_stack = deque(maxlen=HISTORY_LIMIT)
+        self._redo_stack = deque(maxlen=HISTORY_LIMIT)
+
+    def _columns(self) -> tuple:
+        return (self.ids, self.texts, self.deadlines, self.deadline_strs)
+
+    def _set_columns(self, columns: tuple):
+        self.ids, self.texts, self.deadlines, self.deadline_strs = columns
 
-    def _snapshot_for_undo(self):
-        self._undo_stack.append(deepcopy(self.tasks))
+    def rows(self):
+        # Task views over the columns, for rendering
+        return map(Task, *self._columns())
+
+    def _append_row(self, task: Task):
+        for column, value in zip(self._columns(), task):
+            column.append(value)
+
+    def _insert_row(self, index: int, task: Task):
+        for column, value in zip(self._columns(), task):
+            column.insert(index, value)
+
+    def _pop_row(self, index: int = -1) -> Task:
+        return Task._make(column.pop(index) for column in self._columns())
+
+    def _push_undo(self, op: tuple):
+        self._undo_stack.append(op)
+        self._redo_stack.clear()
 
     def add_task(self, text: str, deadline: datetime | None):
         if not text:
             return
-        self._snapshot_for_undo()
-        self.tasks.append({"text": text, "deadline": deadline})
-        self._redo_stack.clear()
+        task = Task(self._next_id, text, deadline, format_deadline(deadline))
+        self._next_id += 1
+        self._append_row(task)
+        self._push_undo(("add", task))
 
     def remove_task(self, index: int):
-        if index < 0 or index >= len(self.tasks):
+        if index < 0 or index >= len(self.texts):
             return
-        self._snapshot_for_undo()
-        self.tasks.pop(index)
-        self._redo_stack.clear()
+        task = self._pop_row(index)
+        self._push_undo(("remove", index, task))
+
+    def remove_task_by_id(self, task_id: int):
+        if task_id not in self.ids:
+            return
+        self.remove_task(self.ids.index(task_id))
 
     def clear(self):
-        if not self.tasks:
+        if not self.texts:
             return
-        self._snapshot_for_undo()
-        self.tasks = []
-        self._redo_stack.clear()
+        # hand the old lists to the undo stack instead of copying them
+        self._push_undo(("clear", self._columns()))
+        self._set_columns(([], [], [], []))
 
     def undo(self):
         if not self._undo_stack:
             return
-        self._redo_stack.append(deepcopy(self.tasks))
-        self.tasks = self._undo_stack.pop()
+        op = self._undo_stack.pop()
+        kind = op[0]
+        if kind == "add":
+            self._pop_row()
+        elif kind == "remove":
+            self._insert_row(op[1], op[2])
+        elif kind == "clear":
+            self._set_columns(op[1])
+        self._redo_stack.append(op)
 
     def redo(self):
         if not self._redo_stack:
             return
-        self._undo_stack.append(deepcopy(self.tasks))
-        self.tasks = self._redo_stack.pop()
+        op = self._redo_stack.pop()
+        kind = op[0]
+        if kind == "add":
+            self._append_row(op[1])
+        elif kind == "remove":
+            self._pop_row(op[1])
+        elif kind == "clear":
+            op = ("clear", self._columns())
+            self._set_columns(([], [], [], []))
+        self._undo_stack.append(op)
 
 # ---------------------------
-# Session state initialization
+# Shared user store: one dict for the whole server process, so a sign up is
+# visible from every session. Reruns and sessions run on different threads,
+# so access goes through get_users_lock().
+# At most MAX_USERS accounts are kept; once full, new sign ups are refused
+# and existing accounts are never removed.
 # ---------------------------
-if 'users' not in st.session_state:
+MAX_USERS = 1000
+
+@st.cache_resource
+def get_users() -> dict:
     # store usernames -> password_hash
-    st.session_state.users = {}
+    return {}
 
-if 'current_user' not in st.session_state:
-    st.session_state.current_user = None
+@st.cache_resource
+def get_users_lock() -> threading.Lock:
+    return threading.Lock()
+
+# ---------------------------
+# Session state initialization
+# ---------------------------
+
+def _lazy_init(key: str, factory):
+    # factory is only called when the key is missing, so reruns build nothing
+    if key not in st.session_state:
+        st.session_state[key] = factory()
 
-if 'todo' not in st.session_state:
-    st.session_state.todo = ToDoStack()
+_lazy_init('current_user', lambda: None)
+# username -> ToDoStack
+_lazy_init('todo_by_user', dict)
+_lazy_init('show_panel', lambda: False)
 
-if 'show_panel' not in st.session_state:
-    st.session_state.show_panel = False
+def get_todo() -> ToDoStack:
+    stacks = st.session_state.todo_by_user
+    user = st.session_state.current_user
+    if user not in stacks:
+        stacks[user] = ToDoStack()
+    return stacks[user]
 
 # ---------------------------
 # Authentication UI
@@ -85,19 +181,28 @@ def signup(username: str, password: str):
     if not username or not password:
         st.warning("Enter both username and password.")
         return False
-    if username in st.session_state.users:
-        st.warning("Username already exists. Choose another.")
-        return False
-    st.session_state.users[username] = hash_password(password)
+    password_hash = hash_password(password)
+    with get_users_lock():
+        users = get_users()
+        if username in users:
+            st.warning("Username already exists. Choose another.")
+            return False
+        if len(users) >= MAX_USERS:
+            st.warning("Sign ups are closed: the account limit has been reached.")
+            return False
+        users[username] = password_hash
     st.success("Sign up successful — you can now log in.")
     return True
 
 
 def login(username: str, password: str):
-    if username not in st.session_state.users:
+    with get_users_lock():
+        stored = get_users().get(username)
+    if stored is None:
         st.error("No such user. Please sign up first.")
         return False
-    if st.session_state.users[username] != hash_password(password):
+    submitted = hash_password(password)
+    if not hmac.compare_digest(stored, submitted):
         st.error("Incorrect password.")
         return False
     st.session_state.current_user = username
@@ -128,7 +233,7 @@ with top_cols[2]:
 # If not logged in, show sign up / login page
 if not st.session_state.current_user:
     st.title("Welcome — please Sign Up or Log In")
-    st.write("This demo stores user accounts in session state only (temporary).")
+    st.write("This demo stores user accounts in server memory only (temporary).")
 
     auth_tabs = st.tabs(["Log in", "Sign up"])
 
@@ -156,6 +261,8 @@ if not st.session_state.current_user:
 # Logged-in main app
 # ---------------------------
 
+todo = get_todo()
+
 st.title(f"📝 To-Do List — {st.session_state.current_user}")
 st.write("Enter tasks with a deadline (date + optional time). Use Undo / Redo.")
 
@@ -163,40 +270,13 @@ st.write("Enter tasks with a deadline (date + optional time). Use Undo / Redo.")
 if st.session_state.show_panel:
     # using sidebar to appear on the left; user wanted left-up side
     st.sidebar.title("Your tasks")
-    if not st.session_state.todo.tasks:
+    if not todo.texts:
         st.sidebar.write("No tasks yet.")
     else:
-        for i, t in enumerate(st.session_state.todo.tasks):
-            dl = t['deadline']
-            dl_str = dl.strftime('%Y-%m-%d %H:%M') if dl else 'No deadline'
-            st.sidebar.write(f"{i+1}. {t['text']} — {dl_str}")
-
-# Add task form
-with st.form("add_task_form", clear_on_submit=False):
-    task_text = st.text_input("Enter your task", key="task_text")
-    col_date, col_time = st.columns(2)
-    with col_date:
-        task_date = st.date_input("Deadline date (optional)", value=None)
-    with col_time:
-        task_time = st.time_input("Deadline time (optional)", value=None)
-
-    submitted_task = st.form_submit_button("Add Task")
-    if submitted_task and task_text.strip():
-        # combine date and time if provided; if both None -> deadline None
-        deadline = None
-        # streamlit date_input and time_input cannot return None by default; handle default
-        try:
-            # If user didn't change, Streamlit sets today's date/time; we want optional.
-            # We'll treat the presence of text in task_date_input to mean user wants deadline.
-            # To keep things simple: if user chooses a date (any value) we use it; otherwise None.
-            if isinstance(task_date, date):
-                # if user set date, use it; if not — task_date will be today (but we cannot detect easily)
-                # We'll provide a checkbox to let user specify whether they want a deadline.
-                pass
-        except Exception:
-            pass
-
-# Better UX: ask explicitly if they want a deadline
+        for i, t in enumerate(todo.rows()):
+            st.sidebar.write(f"{i+1}. {t.text} — {t.deadline_str}")
+
+# Add task form: ask explicitly if they want a deadline
 with st.form("add_task_with_deadline", clear_on_submit=True):
     t_text = st.text_input("Task (required)", key="task_text2")
     want_deadline = st.checkbox("Add a deadline?", key="want_deadline")
@@ -210,48 +290,51 @@ with st.form("add_task_with_deadline", clear_on_submit=True):
         deadline_dt = None
         if want_deadline and dl_date:
             # combine date and time (if time not set, default midnight)
-            if isinstance(dl_time, time):
-                deadline_dt = datetime.combine(dl_date, dl_time)
-            else:
-                deadline_dt = datetime.combine(dl_date, time(0, 0))
-        st.session_state.todo.add_task(t_text.strip(), deadline_dt)
+            deadline_dt = datetime.combine(dl_date, dl_time or _MIDNIGHT)
+        todo.add_task(t_text.strip(), deadline_dt)
         st.success("Task added")
 
 # Undo / Redo / Clear buttons
 cols = st.columns([1,1,1,6])
 with cols[0]:
     if st.button("Undo", key="undo_btn_main"):
-        st.session_state.todo.undo()
+        todo.undo()
 with cols[1]:
     if st.button("Redo", key="redo_btn_main"):
-        st.session_state.todo.redo()
+        todo.redo()
 with cols[2]:
     if st.button("Clear all", key="clear_all_main"):
-        st.session_state.todo.clear()
+        todo.clear()
 
 # Show tasks in main area with delete option and deadline display
 st.subheader("Tasks")
-if not st.session_state.todo.tasks:
+if not todo.texts:
     st.info("No tasks. Add a task above.")
 else:
-    for idx, item in enumerate(st.session_state.todo.tasks):
-     dl = item['deadline']
-     dl = item['deadline']
-     dl_str = dl.strftime('%Y-%m-%d %H:%M') if dl else 'No deadline'
-    row_cols = st.columns([8,1])
-    with row_cols[0]:
-        st.markdown(f"""
-        **{idx+1}. {item['text']}**  
-        _Deadline:_ {dl_str}
-        """)
-    with row_cols[1]:
-        if st.button("Delete", key=f"del_{idx}"):
-            st.session_state.todo.remove_task(idx)
+    # one table and one delete control, however many tasks there are;
+    # the frame is built straight from the stack's column lists
+    st.dataframe(
+        pd.DataFrame({
+            "#": range(1, len(todo.texts) + 1),
+            "Task": todo.texts,
+            "Deadline": todo.deadline_strs,
+        }),
+        hide_index=True,
+        use_container_width=True,
+    )
+    del_cols = st.columns([3,1,5])
+    with del_cols[0]:
+        # options are task ids, so the selection follows the task, not its position
+        labels = {tid: f"{i}. {text}" for i, (tid, text) in enumerate(zip(todo.ids, todo.texts), 1)}
+        del_id = st.selectbox("Delete task", todo.ids, format_func=labels.get, key="del_id")
+    with del_cols[1]:
+        if st.button("Delete", key="del_btn"):
+            todo.remove_task_by_id(del_id)
             st.experimental_rerun()
 
 # small footer showing undo/redo availability
-can_undo = bool(st.session_state.todo._undo_stack)
-can_redo = bool(st.session_state.todo._redo_stack)
+can_undo = bool(todo._undo_stack)
+can_redo = bool(todo._redo_stack)
 st.write(f"Undo available: {can_undo} - Redo available: {can_redo}")
 
 # End of file